@@ -18,11 +18,17 @@
 # Since this should not require frequent updates, we just store this
 # out-of-line and check the generated module into git.
 
+import array
+import concurrent.futures
 import enum
 import math
 import os
 import re
+import shutil
 import sys
+import urllib.request
+
+import numpy as np
 
 NUM_CODEPOINTS = 0x110000
 """An upper bound for which `range(0, NUM_CODEPOINTS)` contains Unicode's codespace."""
@@ -58,6 +64,13 @@ If this is edited, you must ensure that `emit_module` reflects your changes."""
 MODULE_FILENAME = "tables.rs"
 """The filename of the emitted Rust module (will be created in the working directory)"""
 
+ZW_CATEGORIES = frozenset(["Cc", "Cf", "Mn", "Me"])
+"""The general categories whose characters are considered zero-width."""
+
+HEX_BYTES = tuple(f" 0x{i:02X}," for i in range(256))
+"""Every byte value pre-formatted as it appears in an emitted table literal, so the
+emitter does a tuple lookup per byte instead of invoking the format machinery."""
+
 Codepoint = int
 BitPos = int
 
@@ -65,12 +78,15 @@ BitPos = int
 def fetch_open(filename: str):
     """Opens `filename` and return its corresponding file object. If `filename` isn't on disk,
     fetches it from `http://www.unicode.org/Public/UNIDATA/`. Exits with code 1 on failure."""
-    if not os.path.exists(os.path.basename(filename)):
-        os.system(f"curl -O http://www.unicode.org/Public/UNIDATA/{filename}")
+    basename = os.path.basename(filename)
     try:
-        return open(filename, encoding="utf-8")
+        if not os.path.exists(basename):
+            url = f"http://www.unicode.org/Public/UNIDATA/{filename}"
+            with urllib.request.urlopen(url) as response, open(basename, "wb") as out:
+                shutil.copyfileobj(response, out)
+        return open(basename, encoding="utf-8")
     except OSError:
-        sys.stderr.write(f"cannot load {filename}")
+        sys.stderr.write(f"cannot load {basename}")
         sys.exit(1)
 
 
@@ -95,8 +111,8 @@ class EffectiveWidth(enum.IntEnum):
     """ Two columns wide in a CJK context. One column wide in all other contexts. """
 
 
-def load_east_asian_widths() -> "list[EffectiveWidth]":
-    """Return a list of effective widths, indexed by codepoint.
+def load_east_asian_widths() -> "np.ndarray":
+    """Return an array of effective widths, indexed by codepoint.
     Widths are determined by fetching and parsing `EastAsianWidth.txt`.
 
     `Neutral`, `Narrow`, and `Halfwidth` characters are assigned `EffectiveWidth.NARROW`.
@@ -105,76 +121,68 @@ def load_east_asian_widths() -> "list[EffectiveWidth]":
 
     `Ambiguous` chracters are assigned `EffectiveWidth.AMBIGUOUS`."""
     with fetch_open("EastAsianWidth.txt") as eaw:
-        # matches a width assignment for a single codepoint, i.e. "1F336;N  # ..."
-        single = re.compile(r"^([0-9A-F]+);(\w+) +# (\w+)")
-        # matches a width assignment for a range of codepoints, i.e. "3001..3003;W  # ..."
-        multiple = re.compile(r"^([0-9A-F]+)\.\.([0-9A-F]+);(\w+) +# (\w+)")
-        # map between width category code and condensed width
+        # map between width category code and condensed width; the values are plain
+        # ints so the per-line lookup feeds the slice assignment directly
         width_codes = {
-            **{c: EffectiveWidth.NARROW for c in ["N", "Na", "H"]},
-            **{c: EffectiveWidth.WIDE for c in ["W", "F"]},
-            "A": EffectiveWidth.AMBIGUOUS,
+            **{c: int(EffectiveWidth.NARROW) for c in ["N", "Na", "H"]},
+            **{c: int(EffectiveWidth.WIDE) for c in ["W", "F"]},
+            "A": int(EffectiveWidth.AMBIGUOUS),
         }
 
-        width_map = []
+        # Codepoints that don't fall into any of the ranges in EastAsianWidth.txt are
+        # implicitly given Neutral width (resolves to narrow), so the array starts out
+        # all-narrow and only the listed ranges need to be filled in.
+        width_map = np.full(NUM_CODEPOINTS, int(EffectiveWidth.NARROW), dtype=np.uint8)
         current = 0
-        for line in eaw.readlines():
-            raw_data = None  # (low, high, width)
-            if match := single.match(line):
-                raw_data = (match.group(1), match.group(1), match.group(2))
-            elif match := multiple.match(line):
-                raw_data = (match.group(1), match.group(2), match.group(3))
-            else:
+        for line in eaw:
+            # Data lines have the form "<codepoint-or-range>;<width>  # <comment>",
+            # e.g. "1F336;N  # ..." or "3001..3003;W  # ...". The structure is simple
+            # enough that plain string splitting beats a regex here.
+            range_str, sep, code = line.split("#", 1)[0].partition(";")
+            if not sep or (width := width_codes.get(code.strip())) is None:
                 continue
-            low = int(raw_data[0], 16)
-            high = int(raw_data[1], 16)
-            width = width_codes[raw_data[2]]
+            low_str, sep, high_str = range_str.partition("..")
+            low = int(low_str, 16)
+            high = int(high_str, 16) if sep else low
 
-            assert current <= high
-            while current <= high:
-                # Some codepoints don't fall into any of the ranges in EastAsianWidth.txt.
-                # All such codepoints are implicitly given Neural width (resolves to narrow)
-                width_map.append(EffectiveWidth.NARROW if current < low else width)
-                current += 1
-
-        while len(width_map) < NUM_CODEPOINTS:
-            # Catch any leftover codepoints and assign them implicit Neutral/narrow width.
-            width_map.append(EffectiveWidth.NARROW)
+            assert current <= low and low <= high
+            width_map[low : high + 1] = width
+            current = high
 
         return width_map
 
 
-def load_zero_widths() -> "list[bool]":
-    """Returns a list `l` where `l[c]` is true if codepoint `c` is considered a zero-width
-    character. `c` is considered a zero-width character if `c` is in general categories
-    `Cc`, `Cf`, `Mn`, or `Me` (determined by fetching and processing `UnicodeData.txt`)."""
+def load_zero_widths() -> "np.ndarray":
+    """Returns a boolean array `zw` where `zw[c]` is true if codepoint `c` is considered a
+    zero-width character. `c` is considered a zero-width character if `c` is in general
+    categories `Cc`, `Cf`, `Mn`, or `Me` (determined by fetching and processing
+    `UnicodeData.txt`)."""
     with fetch_open("UnicodeData.txt") as categories:
-        zw_map = []
+        # Unassigned characters are implicitly given Neutral width, which is nonzero,
+        # so the array starts out all-false and only assigned codepoints are filled in.
+        zw_map = np.zeros(NUM_CODEPOINTS, dtype=np.bool_)
         current = 0
-        for line in categories.readlines():
-            if len(raw_data := line.split(";")) != 15:
+        range_start = None
+        for line in categories:
+            # Only the codepoint, name, and general category fields matter here, so
+            # leave the remaining twelve fields of each entry unsplit.
+            if len(raw_data := line.split(";", 3)) != 4:
                 continue
-            [codepoint, name, cat_code] = [
-                int(raw_data[0], 16),
-                raw_data[1],
-                raw_data[2],
-            ]
-            zero_width = cat_code in ["Cc", "Cf", "Mn", "Me"]
+            codepoint = int(raw_data[0], 16)
+            name = raw_data[1]
+            zero_width = raw_data[2] in ZW_CATEGORIES
 
             assert current <= codepoint
-            while current <= codepoint:
-                if name.endswith(", Last>") or current == codepoint:
-                    # if name ends with Last, we backfill the width value to all codepoints since
-                    # the previous codepoint (aka the start of the range)
-                    zw_map.append(zero_width)
-                else:
-                    # unassigned characters are implicitly given Neutral width, which is nonzero
-                    zw_map.append(False)
-                current += 1
-
-        while len(zw_map) < NUM_CODEPOINTS:
-            # Catch any leftover codepoints. They must be unassigned (so nonzero width)
-            zw_map.append(False)
+            if name.endswith(", First>"):
+                # The start of a `First`/`Last` range; remember it so the matching `Last`
+                # line can backfill the whole range with one slice assignment.
+                range_start = codepoint
+            elif name.endswith(", Last>"):
+                zw_map[range_start : codepoint + 1] = zero_width
+                range_start = None
+            else:
+                zw_map[codepoint] = zero_width
+            current = codepoint
 
         return zw_map
 
@@ -183,15 +191,24 @@ class Bucket:
     """A bucket contains a group of codepoints and an ordered width list. If one bucket's width
     list overlaps with another's width list, those buckets can be merged via `try_extend`."""
 
-    def __init__(self):
-        """Creates an empty bucket."""
-        self.entry_set = set()
-        self.widths = []
-
-    def append(self, codepoint: Codepoint, width: EffectiveWidth):
-        """Adds a codepoint/width pair to the bucket, and appends `width` to the width list."""
-        self.entry_set.add((codepoint, width))
-        self.widths.append(width)
+    # Tables create tens of thousands of buckets per run; slots skip the per-instance
+    # dict and shave allocation overhead.
+    __slots__ = ("codepoints", "entry_widths", "widths", "sorted")
+
+    def __init__(self, codepoints: "np.ndarray", widths: "np.ndarray"):
+        """Creates a bucket whose codepoints are `codepoints` and whose width list is
+        `widths`. The two arrays must be parallel and sorted by codepoint."""
+        # A codepoint appears in exactly one bucket per table level, so entries never
+        # need deduplication.
+        self.codepoints = codepoints
+        self.entry_widths = widths
+        # The width list is also kept as `bytes` (widths fit in a byte), so that the
+        # prefix comparison in `try_extend` is a single C-level memcmp and the list
+        # can key the deduplication dictionary in `Table`.
+        self.widths = widths.tobytes()
+        # Freshly-made buckets receive their codepoints in ascending order; only a
+        # `try_extend` merge can disturb that, so track it to spare `entries` a sort.
+        self.sorted = True
 
     def try_extend(self, attempt: "Bucket") -> bool:
         """If either `self` or `attempt`'s width list starts with the other bucket's width list,
@@ -200,17 +217,22 @@ class Bucket:
         (less, more) = (self.widths, attempt.widths)
         if len(self.widths) > len(attempt.widths):
             (less, more) = (attempt.widths, self.widths)
-        if less != more[: len(less)]:
+        # `startswith` compares in place; slicing `more` would copy it first.
+        if not more.startswith(less):
             return False
-        self.entry_set |= attempt.entry_set
+        self.codepoints = np.concatenate((self.codepoints, attempt.codepoints))
+        self.entry_widths = np.concatenate((self.entry_widths, attempt.entry_widths))
         self.widths = more
+        self.sorted = False
         return True
 
-    def entries(self) -> "list[tuple[Codepoint, EffectiveWidth]]":
-        """Return a list of the codepoint/width pairs in this bucket, sorted by codepoint."""
-        result = list(self.entry_set)
-        result.sort()
-        return result
+    def entries(self) -> "tuple[np.ndarray, np.ndarray]":
+        """Return this bucket's codepoints and their widths as parallel arrays, sorted by
+        codepoint."""
+        if self.sorted:
+            return (self.codepoints, self.entry_widths)
+        order = np.argsort(self.codepoints)
+        return (self.codepoints[order], self.entry_widths[order])
 
     def width(self) -> "EffectiveWidth":
         """If all codepoints in this bucket have the same width, return that width; otherwise,
@@ -218,23 +240,35 @@ class Bucket:
         if len(self.widths) == 0:
             return None
         potential_width = self.widths[0]
-        for width in self.widths[1:]:
-            if potential_width != width:
-                return None
-        return potential_width
+        # A C-level count beats scanning the width list byte-by-byte in Python.
+        if self.widths.count(potential_width) != len(self.widths):
+            return None
+        return EffectiveWidth(potential_width)
 
 
 def make_buckets(entries, low_bit: BitPos, cap_bit: BitPos) -> "list[Bucket]":
-    """Partitions the `(Codepoint, EffectiveWidth)` tuples in `entries` into `Bucket`s. All
+    """Partitions `entries`, parallel arrays of codepoints and widths, into `Bucket`s. All
     codepoints with identical bits from `low_bit` to `cap_bit` (exclusive) are placed in the
     same bucket. Returns a list of the buckets in increasing order of those bits."""
     num_bits = cap_bit - low_bit
     assert num_bits > 0
-    buckets = [Bucket() for _ in range(0, 2 ** num_bits)]
+    (codepoints, widths) = entries
     mask = (1 << num_bits) - 1
-    for (codepoint, width) in entries:
-        buckets[(codepoint >> low_bit) & mask].append(codepoint, width)
-    return buckets
+    bucket_ids = (codepoints >> low_bit) & mask
+    # Group the entries by bucket id. The stable sort keeps entries sharing a bucket in
+    # codepoint order, so each bucket is a contiguous slice of the reordered arrays.
+    # The top-level table sees the codepoints in ascending order, so its ids arrive
+    # pre-grouped and the sort-and-gather can be skipped outright.
+    if not np.all(bucket_ids[:-1] <= bucket_ids[1:]):
+        order = np.argsort(bucket_ids, kind="stable")
+        codepoints = codepoints[order]
+        widths = widths[order]
+        bucket_ids = bucket_ids[order]
+    starts = np.searchsorted(bucket_ids, np.arange(2 ** num_bits + 1))
+    return [
+        Bucket(codepoints[low:high], widths[low:high])
+        for (low, high) in zip(starts, starts[1:])
+    ]
 
 
 class Table:
@@ -254,56 +288,80 @@ class Table:
     def __init__(
         self, entry_groups, low_bit: BitPos, cap_bit: BitPos, offset_type: OffsetType
     ):
-        """Create a lookup table with a sub-table for each `(Codepoint, EffectiveWidth)` iterator
-        in `entry_groups`. Each sub-table is indexed by codepoint bits in `low_bit..cap_bit`,
+        """Create a lookup table with a sub-table for each codepoint/width array pair in
+        `entry_groups`. Each sub-table is indexed by codepoint bits in `low_bit..cap_bit`,
         and each table entry is represented in the format specified by  `offset_type`. Asserts
         that this table is actually representable with `offset_type`."""
         self.low_bit = low_bit
         self.cap_bit = cap_bit
         self.offset_type = offset_type
-        self.entries = []
+        # Entries are always byte-sized indices (offset types top out at `U8`), so an
+        # unboxed byte array beats a list of boxed ints for memory and cache behavior.
+        self.entries = array.array("B")
         self.indexed = []
 
         buckets = []
         for entries in entry_groups:
             buckets.extend(make_buckets(entries, self.low_bit, self.cap_bit))
 
+        # A map from a bucket's width list to its index in `self.indexed`. Buckets with
+        # identical width lists (the common case by far) are deduplicated with a single
+        # dictionary lookup; the linear `try_extend` scan only remains as a fallback for
+        # the rare prefix-extension merges, which a flat key can't express.
+        by_widths = {}
         for bucket in buckets:
+            key = bytes(bucket.widths)
+            if (index := by_widths.get(key)) is not None:
+                merged = self.indexed[index].try_extend(bucket)
+                assert merged
+                self.entries.append(index)
+                continue
             for (i, existing) in enumerate(self.indexed):
                 if existing.try_extend(bucket):
+                    # `bucket` may have extended `existing`'s width list; index the
+                    # merged bucket under its (possibly longer) new width list too.
+                    by_widths[bytes(existing.widths)] = i
                     self.entries.append(i)
                     break
             else:
+                by_widths[key] = len(self.indexed)
                 self.entries.append(len(self.indexed))
                 self.indexed.append(bucket)
 
         # Validate offset type
+        entry_limit = 1 << int(self.offset_type)
         for index in self.entries:
-            assert index < (1 << int(self.offset_type))
+            assert index < entry_limit
 
     def indices_to_widths(self):
         """Destructively converts the indices in this table to the `EffectiveWidth` values of
         their buckets. Assumes that no bucket contains codepoints with different widths."""
-        self.entries = list(map(lambda i: int(self.indexed[i].width()), self.entries))
+        # Resolve each bucket's width once, then map the (many) entries through the
+        # (few) resolved values.
+        widths = [int(bucket.width()) for bucket in self.indexed]
+        self.entries = array.array("B", map(widths.__getitem__, self.entries))
         del self.indexed
 
     def buckets(self):
         """Returns an iterator over this table's buckets."""
         return self.indexed
 
-    def to_bytes(self) -> "list[int]":
-        """Returns this table's entries as a list of bytes. The bytes are formatted according to
+    def to_bytes(self) -> "bytes":
+        """Returns this table's entries packed into a `bytes` object, formatted according to
         the `OffsetType` which the table was created with, converting any `EffectiveWidth` entries
         to their enum variant's integer value. For example, with `OffsetType.U2`, each byte will
         contain four packed 2-bit entries."""
-        entries_per_byte = 8 // int(self.offset_type)
-        byte_array = []
-        for i in range(0, len(self.entries), entries_per_byte):
-            byte = 0
-            for j in range(0, entries_per_byte):
-                byte |= self.entries[i + j] << (j * int(self.offset_type))
-            byte_array.append(byte)
-        return byte_array
+        offset_bits = int(self.offset_type)
+        entries_per_byte = 8 // offset_bits
+        if entries_per_byte == 1:
+            # Each entry already is a byte; no packing needed.
+            return bytes(self.entries)
+        assert len(self.entries) % entries_per_byte == 0
+        # Pack the entries of each byte with one vectorized shift-and-or instead of a
+        # nested Python loop over every entry.
+        grouped = np.asarray(self.entries, dtype=np.uint8).reshape(-1, entries_per_byte)
+        shifts = np.arange(entries_per_byte, dtype=np.uint8) * offset_bits
+        return np.bitwise_or.reduce(grouped << shifts, axis=1).tobytes()
 
 
 def make_tables(
@@ -311,26 +369,46 @@ def make_tables(
 ) -> "list[Table]":
     """Creates a table for each configuration in `table_cfgs`, with the first config corresponding
     to the top-level lookup table, the second config corresponding to the second-level lookup
-    table, and so forth. `entries` is an iterator over the `(Codepoint, EffectiveWidth)` pairs
-    to include in the top-level table."""
+    table, and so forth. `entries` is a pair of parallel codepoint/width arrays holding the
+    entries of the top-level table."""
     tables = []
     entry_groups = [entries]
     for (low_bit, cap_bit, offset_type) in table_cfgs:
         table = Table(entry_groups, low_bit, cap_bit, offset_type)
-        entry_groups = map(lambda bucket: bucket.entries(), table.buckets())
+        # Materialize eagerly: entries() may gather merged buckets, and a lazy map
+        # would silently redo that work if the groups were ever walked twice.
+        entry_groups = [bucket.entries() for bucket in table.buckets()]
         tables.append(table)
     return tables
 
 
+def emit_table_bytes(parts: "list[str]", byte_array):
+    """Formats `byte_array` as the body of a Rust byte-array literal (including the
+    closing bracket), laid out to match rustfmt, and appends the fragments to `parts`."""
+    for (j, byte) in enumerate(byte_array):
+        # Add line breaks for every 15th entry (chosen to match what rustfmt does)
+        if j % 15 == 0:
+            parts.append("\n       ")
+        parts.append(HEX_BYTES[byte])
+    parts.append("\n    ];\n")
+
+
 def emit_module(
-    out_name: str, unicode_version: "tuple[int, int, int]", tables: "list[Table]"
+    out_name: str,
+    unicode_version: "tuple[int, int, int]",
+    tables: "list[Table]",
+    width_map: "np.ndarray",
 ):
-    """Outputs a Rust module to `out_name` using table data from `tables`.
+    """Outputs a Rust module to `out_name` using table data from `tables` and the widths of
+    the first 256 codepoints from `width_map`.
     If `TABLE_CFGS` is edited, you may need to edit the included code for `lookup_width`."""
     if os.path.exists(out_name):
         os.remove(out_name)
     with open(out_name, "w", newline="\n", encoding="utf-8") as module:
-        module.write(
+        # Accumulate the module source as a list of fragments and write it with a
+        # single call, instead of issuing one small write per table byte.
+        parts = []
+        parts.append(
             """// Copyright 2012-2022 The Rust Project Developers. See the COPYRIGHT
 // file at the top-level directory of this distribution and at
 // http://rust-lang.org/COPYRIGHT.
@@ -344,7 +422,7 @@ def emit_module(
 // NOTE: The following code was generated by "scripts/unicode.py", do not edit directly
 """
         )
-        module.write(
+        parts.append(
             f"""
 /// The version of [Unicode](http://www.unicode.org/)
 /// that this version of unicode-width is based on.
@@ -352,7 +430,7 @@ pub const UNICODE_VERSION: (u8, u8, u8) = {unicode_version};
 """
         )
 
-        module.write(
+        parts.append(
             """
 pub mod charwidth {
     use core::option::Option::{self, None, Some};
@@ -371,21 +449,27 @@ pub mod charwidth {
     fn lookup_width(c: char, is_cjk: bool) -> usize {
         let cp = c as usize;
 
-        let t1_offset = TABLES_0[cp >> 13 & 0xFF];
+        // Codepoints below U+0100 are common enough to deserve a fast path: a single
+        // load from WIDTHS_LATIN1 replaces the three dependent table lookups.
+        let width = if cp < 0x100 {
+            WIDTHS_LATIN1[cp]
+        } else {
+            let t1_offset = TABLES_0[cp >> 13 & 0xFF];
 
-        // Each sub-table in TABLES_1 is 7 bits, and each stored entry is a byte,
-        // so each sub-table is 128 bytes in size.
-        // (Sub-tables are selected using the computed offset from the previous table.)
-        let t2_offset = TABLES_1[128 * usize::from(t1_offset) + (cp >> 6 & 0x7F)];
+            // Each sub-table in TABLES_1 is 7 bits, and each stored entry is a byte,
+            // so each sub-table is 128 bytes in size.
+            // (Sub-tables are selected using the computed offset from the previous table.)
+            let t2_offset = TABLES_1[128 * usize::from(t1_offset) + (cp >> 6 & 0x7F)];
 
-        // Each sub-table in TABLES_2 is 6 bits, but each stored entry is 2 bits.
-        // This is accomplished by packing four stored entries into one byte.
-        // So each sub-table is 2**(6-2) == 16 bytes in size.
-        // Since this is the last table, each entry represents an encoded width.
-        let packed_widths = TABLES_2[16 * usize::from(t2_offset) + (cp >> 2 & 0xF)];
+            // Each sub-table in TABLES_2 is 6 bits, but each stored entry is 2 bits.
+            // This is accomplished by packing four stored entries into one byte.
+            // So each sub-table is 2**(6-2) == 16 bytes in size.
+            // Since this is the last table, each entry represents an encoded width.
+            let packed_widths = TABLES_2[16 * usize::from(t2_offset) + (cp >> 2 & 0xF)];
 
-        // Extract the packed width
-        let width = packed_widths >> (2 * (cp & 0b11)) & 0b11;
+            // Extract the packed width
+            packed_widths >> (2 * (cp & 0b11)) & 0b11
+        };
 
         // A width of 3 signifies that the codepoint is ambiguous width.
         if width == 3 {
@@ -401,7 +485,7 @@ pub mod charwidth {
 """
         )
 
-        module.write(
+        parts.append(
             """
     /// Returns the [UAX #11](https://www.unicode.org/reports/tr11/) based width of `c`, or
     /// `None` if `c` is a control character other than `'\\x00'`.
@@ -431,25 +515,29 @@ pub mod charwidth {
 """
         )
 
+        parts.append(
+            """
+    /// Autogenerated. Widths of codepoints `U+0000..=U+00FF`, in the same encoding as the
+    /// entries of [`TABLES_2`] but stored one per byte. Consult [`lookup_width`].
+    static WIDTHS_LATIN1: [u8; 256] = ["""
+        )
+        emit_table_bytes(parts, bytes(width_map[:0x100]))
+
         subtable_count = 1
         for (i, table) in enumerate(tables):
             new_subtable_count = len(table.buckets())
             if i == len(tables) - 1:
                 table.indices_to_widths()  # for the last table, indices == widths
             byte_array = table.to_bytes()
-            module.write(
+            parts.append(
                 f"""
     /// Autogenerated. {subtable_count} sub-table(s). Consult [`lookup_width`] for layout info.
     static TABLES_{i}: [u8; {len(byte_array)}] = ["""
             )
-            for (j, byte) in enumerate(byte_array):
-                # Add line breaks for every 15th entry (chosen to match what rustfmt does)
-                if j % 15 == 0:
-                    module.write("\n       ")
-                module.write(f" 0x{byte:02X},")
-            module.write("\n    ];\n")
+            emit_table_bytes(parts, byte_array)
             subtable_count = new_subtable_count
-        module.write("}\n")
+        parts.append("}\n")
+        module.write("".join(parts))
 
 
 def main(module_filename: str):
@@ -471,22 +559,33 @@ def main(module_filename: str):
     version = load_unicode_version()
     print(f"Generating module for Unicode {version[0]}.{version[1]}.{version[2]}")
 
-    eaw_map = load_east_asian_widths()
-    zw_map = load_zero_widths()
+    # Parsing the data files dominates the script's runtime, so cache the parsed
+    # arrays keyed on the Unicode version; repeated runs skip both loaders.
+    cache_filename = ".unicode_cache_{}_{}_{}.npz".format(*version)
+    if os.path.exists(cache_filename):
+        cache = np.load(cache_filename)
+        (eaw_map, zw_map) = (cache["eaw"], cache["zw"])
+    else:
+        # The two loaders are independent fetch-then-parse pipelines over disjoint
+        # files, so run them concurrently; on a cold start the downloads overlap.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            eaw_future = executor.submit(load_east_asian_widths)
+            zw_future = executor.submit(load_zero_widths)
+            eaw_map = eaw_future.result()
+            zw_map = zw_future.result()
+        np.savez(cache_filename, eaw=eaw_map, zw=zw_map)
 
     # Characters marked as zero-width in zw_map should be zero-width in the final map
-    width_map = list(
-        map(lambda x: EffectiveWidth.ZERO if x[1] else x[0], zip(eaw_map, zw_map))
-    )
+    width_map = np.where(zw_map, np.uint8(EffectiveWidth.ZERO), eaw_map)
 
     # Override for soft hyphen
-    width_map[0x00AD] = EffectiveWidth.NARROW
+    width_map[0x00AD] = int(EffectiveWidth.NARROW)
 
     # Override for Hangul Jamo medial vowels & final consonants
-    for i in range(0x1160, 0x11FF + 1):
-        width_map[i] = EffectiveWidth.ZERO
+    width_map[0x1160 : 0x11FF + 1] = int(EffectiveWidth.ZERO)
 
-    tables = make_tables(TABLE_CFGS, enumerate(width_map))
+    codepoints = np.arange(NUM_CODEPOINTS, dtype=np.uint32)
+    tables = make_tables(TABLE_CFGS, (codepoints, width_map))
 
     print("------------------------")
     total_size = 0
@@ -497,7 +596,7 @@ def main(module_filename: str):
     print("------------------------")
     print(f"  Total Size: {total_size} bytes")
 
-    emit_module(module_filename, version, tables)
+    emit_module(module_filename, version, tables, width_map)
     print(f'Wrote to "{module_filename}"')
 
 
@@ -31,21 +31,27 @@ pub mod charwidth {
     fn lookup_width(c: char, is_cjk: bool) -> usize {
         let cp = c as usize;
 
-        let t1_offset = TABLES_0[cp >> 13 & 0xFF];
+        // Codepoints below U+0100 are common enough to deserve a fast path: a single
+        // load from WIDTHS_LATIN1 replaces the three dependent table lookups.
+        let width = if cp < 0x100 {
+            WIDTHS_LATIN1[cp]
+        } else {
+            let t1_offset = TABLES_0[cp >> 13 & 0xFF];
 
-        // Each sub-table in TABLES_1 is 7 bits, and each stored entry is a byte,
-        // so each sub-table is 128 bytes in size.
-        // (Sub-tables are selected using the computed offset from the previous table.)
-        let t2_offset = TABLES_1[128 * usize::from(t1_offset) + (cp >> 6 & 0x7F)];
+            // Each sub-table in TABLES_1 is 7 bits, and each stored entry is a byte,
+            // so each sub-table is 128 bytes in size.
+            // (Sub-tables are selected using the computed offset from the previous table.)
+            let t2_offset = TABLES_1[128 * usize::from(t1_offset) + (cp >> 6 & 0x7F)];
 
-        // Each sub-table in TABLES_2 is 6 bits, but each stored entry is 2 bits.
-        // This is accomplished by packing four stored entries into one byte.
-        // So each sub-table is 2**(6-2) == 16 bytes in size.
-        // Since this is the last table, each entry represents an encoded width.
-        let packed_widths = TABLES_2[16 * usize::from(t2_offset) + (cp >> 2 & 0xF)];
+            // Each sub-table in TABLES_2 is 6 bits, but each stored entry is 2 bits.
+            // This is accomplished by packing four stored entries into one byte.
+            // So each sub-table is 2**(6-2) == 16 bytes in size.
+            // Since this is the last table, each entry represents an encoded width.
+            let packed_widths = TABLES_2[16 * usize::from(t2_offset) + (cp >> 2 & 0xF)];
 
-        // Extract the packed width
-        let width = packed_widths >> (2 * (cp & 0b11)) & 0b11;
+            // Extract the packed width
+            packed_widths >> (2 * (cp & 0b11)) & 0b11
+        };
 
         // A width of 3 signifies that the codepoint is ambiguous width.
         if width == 3 {
@@ -85,6 +91,29 @@ pub mod charwidth {
         }
     }
 
+    /// Autogenerated. Widths of codepoints `U+0000..=U+00FF`, in the same encoding as the
+    /// entries of [`TABLES_2`] but stored one per byte. Consult [`lookup_width`].
+    static WIDTHS_LATIN1: [u8; 256] = [
+        0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+        0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+        0x00, 0x00, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01,
+        0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01,
+        0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01,
+        0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01,
+        0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01,
+        0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01,
+        0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+        0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+        0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x01, 0x03, 0x01, 0x01, 0x03,
+        0x01, 0x01, 0x03, 0x03, 0x01, 0x03, 0x01, 0x01, 0x01, 0x03, 0x01, 0x03, 0x03, 0x03, 0x03,
+        0x03, 0x01, 0x03, 0x03, 0x03, 0x03, 0x03, 0x01, 0x03, 0x03, 0x03, 0x03, 0x01, 0x01, 0x01,
+        0x01, 0x01, 0x01, 0x03, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x03, 0x01,
+        0x01, 0x01, 0x01, 0x01, 0x01, 0x03, 0x03, 0x01, 0x01, 0x01, 0x01, 0x01, 0x03, 0x03, 0x03,
+        0x03, 0x01, 0x01, 0x01, 0x01, 0x03, 0x01, 0x03, 0x03, 0x03, 0x01, 0x03, 0x03, 0x01, 0x01,
+        0x03, 0x01, 0x03, 0x03, 0x01, 0x01, 0x01, 0x03, 0x03, 0x03, 0x03, 0x01, 0x03, 0x01, 0x03,
+        0x01,
+    ];
+
     /// Autogenerated. 1 sub-table(s). Consult [`lookup_width`] for layout info.
     static TABLES_0: [u8; 256] = [
         0x00, 0x01, 0x02, 0x03, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D,